@@ -2,6 +2,14 @@ import sys
 import os
 import platform
 import subprocess
+import multiprocessing
+import tempfile
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from io import BytesIO
 from datetime import datetime
 
@@ -15,11 +23,229 @@ from PyQt5.QtCore import Qt, QThread, pyqtSignal, QSize
 from PyQt5.QtGui import QIcon, QDragEnterEvent, QDropEvent
 
 # Processing Libraries
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
 from pptx import Presentation
 from pptx.util import Inches, Cm
 from PIL import Image
 
+# 高速JPEGエンコーダ (libjpeg-turbo)。未インストールの場合はPillowで代替する
+try:
+    import numpy as np
+    import simplejpeg
+except ImportError:
+    np = None
+    simplejpeg = None
+
+# PDFium (pypdfium2) があればPDFをプロセス内で描画する。未インストールの場合はPopplerを使う
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+# 画像ファイルのヘッダだけを読んでサイズを取得する。未インストールの場合はPillowで代替する
+try:
+    import imagesize
+except ImportError:
+    imagesize = None
+
+
+# Popplerのページ並列描画に使うスレッド数 (Qtスレッドとエンコード用に余裕を残す)
+RASTERIZE_THREADS = max(1, (os.cpu_count() or 1) // 2)
+
+# PDFを並列に画像化するプロセス数 (先読みする件数も兼ねる)
+POOL_WORKERS = os.cpu_count() or 1
+
+# PDFが1つだけの場合に、ページ範囲に分けてプロセスプールで描画する最小ページ数
+# (子プロセスの起動にかかる時間より描画時間が長くなる目安)
+SPLIT_MIN_PAGES = 16
+
+# 画像化スレッドとスライド組み立ての間に置くページキューの長さ
+PAGE_QUEUE_SIZE = 4
+
+# ページごとのステータス表示の最短間隔 (秒) と表示形式
+STATUS_INTERVAL = 0.1
+PAGE_STATUS = "[%d/%d] %s: ページ %d / %d を変換中"
+
+# PPTX保存時の書き込みバッファサイズ
+SAVE_BUFFER_SIZE = 16 * 1024 * 1024
+
+
+def _rasterize(path, dpi, quality, output_folder, thread_count=1, first_page=None, last_page=None):
+    """
+    PDFを画像化してoutput_folderにページごとのJPEGを書き出し、そのパスを返す
+    (プロセスプールから呼び出すためトップレベルに定義)
+    ページをメモリに溜めないので、ページ数が多くてもメモリ使用量は増えない
+    first_page, last_page (1始まり、両端を含む) を指定した場合はその範囲だけを画像化する
+    """
+    if pdfium is not None:
+        return _rasterize_pdfium(path, dpi, quality, output_folder, first_page, last_page)
+
+    # Popplerが出力したJPEGをそのまま使うため、再エンコードは行わない
+    return convert_from_path(
+        path, dpi=dpi, fmt='jpeg', jpegopt={"quality": quality, "progressive": False, "optimize": False},
+        output_folder=output_folder, paths_only=True, thread_count=thread_count,
+        first_page=first_page, last_page=last_page
+    )
+
+
+def _open_pdfium(path):
+    """PDFiumでPDFを開く (フォームの入力内容も描画し、Popplerと同じ結果にする)"""
+    pdf = pdfium.PdfDocument(path)
+    pdf.init_forms()
+    return pdf
+
+
+def _pdfium_jpegs(pdf, dpi, quality, start, stop):
+    """
+    PDFiumでページ (0始まり、stopは含まない) を1枚ずつ描画し、JPEGバイト列を返す
+    (PDFiumはスレッドセーフではないため、ページの並列描画は行わない)
+    """
+    for p_idx in range(start, stop):
+        page = pdf[p_idx]
+        try:
+            img = page.render(scale=dpi / 72).to_pil()
+        finally:
+            page.close()
+        yield _encode_jpeg(img, quality)
+
+
+def _rasterize_pdfium(path, dpi, quality, output_folder, first_page=None, last_page=None):
+    """PDFiumでページを描画し、JPEGにエンコードして書き出す (プロセスプール用)"""
+    prefix = uuid.uuid4().hex
+    paths = []
+    pdf = _open_pdfium(path)
+    try:
+        start = (first_page or 1) - 1
+        stop = min(last_page or len(pdf), len(pdf))
+        for p_idx, data in enumerate(_pdfium_jpegs(pdf, dpi, quality, start, stop), start + 1):
+            page_path = os.path.join(output_folder, f"{prefix}-{p_idx:04d}.jpg")
+            with open(page_path, 'wb') as f:
+                f.write(data)
+            paths.append(page_path)
+    finally:
+        pdf.close()
+    return paths
+
+
+def _stream_pdfium(path, dpi, quality):
+    """
+    PDFiumで描画したページを一時ファイルを経由せずに順に返す (このプロセス内で使う)
+    戻り値は (ページ数, JPEGバイト列のイテレータ)
+    描画とスライドの組み立てがページ単位で重なるが、描画自体は1コアで行う
+    """
+    pdf = _open_pdfium(path)
+    page_count = len(pdf)
+
+    def pages():
+        try:
+            yield from _pdfium_jpegs(pdf, dpi, quality, 0, page_count)
+        finally:
+            pdf.close()
+
+    if not page_count:
+        pdf.close()
+        return 0, iter(())
+    return page_count, pages()
+
+
+def _pdf_page_count(path):
+    """PDFのページ数をページを描画せずに取得"""
+    if pdfium is not None:
+        pdf = pdfium.PdfDocument(path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    return int(pdfinfo_from_path(path)["Pages"])
+
+
+def _page_ranges(page_count):
+    """
+    ページ範囲 (1始まり、両端を含む) をプロセスプールの数に分割する
+    page_countがNoneの場合はPDF全体を1つの範囲とする
+    """
+    if not page_count:
+        return [(None, None)]
+    chunk = -(-page_count // POOL_WORKERS)
+    return [(first, min(first + chunk - 1, page_count)) for first in range(1, page_count + 1, chunk)]
+
+
+def _pdf_page_size(path):
+    """PDFの1ページ目のサイズ (ポイント) をページを描画せずに取得"""
+    if pdfium is not None:
+        pdf = pdfium.PdfDocument(path)
+        try:
+            page = pdf[0]
+            try:
+                return page.get_size()
+            finally:
+                page.close()
+        finally:
+            pdf.close()
+
+    # 例: "Page size: 612 x 792 pts (letter)"
+    info = pdfinfo_from_path(path)
+    width_pt, _, height_pt = info["Page size"].split()[:3]
+    if int(info.get("Page rot", 0)) % 180:
+        width_pt, height_pt = height_pt, width_pt
+    return float(width_pt), float(height_pt)
+
+
+def _jpeg_quality(pixels):
+    """
+    JPEG画質を (縮小後の) 画素数から決める
+    画面表示向けの小さな画像は画質を抑え、印刷向けの大きな画像ほど画質を上げる
+    入力DPIではなく、実際にスライドへ埋め込む画素数で判断する
+    """
+    if pixels < 2_000_000:
+        return 82
+    if pixels < 8_000_000:
+        return 88
+    return 92
+
+
+def _flatten_alpha(img):
+    """RGBA画像の透過部分を白背景に合成してRGB画像にする"""
+    if np is None:
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        background.paste(img, mask=img.getchannel('A'))
+        return background
+
+    a = np.asarray(img, dtype=np.uint8)
+    rgb = a[..., :3].astype(np.uint16)
+    alpha = a[..., 3:4].astype(np.uint16)
+    rgb = ((rgb * alpha + 255 * (255 - alpha)) // 255).astype(np.uint8)
+    return Image.fromarray(rgb)
+
+
+def _encode_jpeg(img, quality):
+    """
+    画像をJPEGバイト列にエンコード
+    速度優先でハフマン最適化・プログレッシブは使わず、高画質時のみ色差を4:2:2に抑える
+    """
+    high_quality = quality >= 90
+    if simplejpeg is not None and img.mode in ('L', '1'):
+        # グレースケールは1チャンネルのまま符号化する (色変換と色差成分が不要)
+        arr = np.ascontiguousarray(np.asarray(img.convert('L'))[..., None])
+        return simplejpeg.encode_jpeg(arr, quality=quality, colorspace='GRAY')
+
+    if simplejpeg is not None and img.mode == 'RGB':
+        # RGBならconvertによる複製を作らず、そのまま配列として渡す
+        arr = np.asarray(img)
+        return simplejpeg.encode_jpeg(
+            arr, quality=quality, colorspace='RGB',
+            colorsubsampling='422' if high_quality else '420'
+        )
+
+    # CMYKや16bit画像などはPillowでエンコード
+    with BytesIO() as image_stream:
+        img.save(
+            image_stream, format="JPEG", quality=quality,
+            optimize=False, progressive=False, subsampling=1 if high_quality else 2
+        )
+        return image_stream.getvalue()
+
+
 class ConversionWorker(QThread):
     """
     変換処理をバックグラウンドで行うスレッド
@@ -29,30 +255,262 @@ class ConversionWorker(QThread):
     finished_signal = pyqtSignal(str)
     error_signal = pyqtSignal(str)
 
-    def __init__(self, file_list, output_dir, dpi=300):
+    def __init__(self, file_list, output_dir, dpi=300, output_dpi=None):
         super().__init__()
         self.file_list = file_list
         self.output_dir = output_dir
         self.dpi = dpi
+        self.output_dpi = output_dpi # スライド上の表示解像度 (Noneなら縮小しない)
         self.is_running = True
+        self._last_emit = 0.0 # 最後にステータスを送った時刻 (time.monotonic)
+
+    def _emit_status(self, message, *args, force=False):
+        """
+        ステータスを送る (GUIスレッドに負荷をかけないよう STATUS_INTERVAL 秒に1回まで)
+        ファイルの切り替わりやエラーは force=True で必ず送る
+        args を指定した場合、文字列の組み立ては実際に送るときだけ行う
+        """
+        now = time.monotonic()
+        if force or now - self._last_emit >= STATUS_INTERVAL:
+            self.status_updated.emit(message % args if args else message)
+            self._last_emit = now
 
     def get_reference_size(self, file_path):
-        """基準サイズ取得"""
+        """基準サイズ取得 (ページの描画や画像のデコードはせず、メタデータだけを読む)"""
         try:
             lower_path = file_path.lower()
             if lower_path.endswith('.pdf'):
-                images = convert_from_path(file_path, dpi=self.dpi, first_page=1, last_page=1)
-                if images:
-                    return images[0].size
-            else:
-                with Image.open(file_path) as img:
-                    return img.size
+                width_pt, height_pt = _pdf_page_size(file_path)
+                return int(width_pt / 72 * self.dpi), int(height_pt / 72 * self.dpi)
+            if imagesize is not None:
+                width, height = imagesize.get(file_path)
+                if width > 0 and height > 0:
+                    return width, height
+            with Image.open(file_path) as img:
+                return img.size
         except Exception:
             pass
         return None
 
-    def run(self):
+    def _load_image(self, file_path, max_size):
+        """画像ファイルを開き、RGB化と表示解像度への縮小を行う"""
+        img = Image.open(file_path)
+        if max_size:
+            # JPEGは縮小デコード (1/2, 1/4, 1/8) で読み込む。JPEG以外では何もしない
+            img.draft('RGB', max_size)
+        if img.mode == 'RGBA':
+            img = _flatten_alpha(img)
+        elif img.mode == 'P':
+            img = img.convert('RGB')
+        if max_size and (img.width > max_size[0] or img.height > max_size[1]):
+            target = (min(img.width, max_size[0]), min(img.height, max_size[1]))
+            img = img.resize(target, Image.Resampling.LANCZOS)
+        return img
+
+    def _put(self, page_queue, item):
+        """キューへ投入 (中断された場合は諦める)"""
+        while self.is_running:
+            try:
+                page_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _collect_pool_pages(self, jobs, file_path, render_dpi, jpg_quality, temp_dir):
+        """
+        プロセスプールに投入したジョブ (ページ範囲ごと) の結果をページ順につなげて返す
+        別のPDFで子プロセスが異常終了していた場合は、その範囲をこのスレッドで描画し直す
+        """
+        paths = []
+        for future, first_page, last_page in jobs:
+            try:
+                paths.extend(future.result())
+            except BrokenProcessPool:
+                paths.extend(_rasterize(
+                    file_path, render_dpi, jpg_quality, temp_dir,
+                    RASTERIZE_THREADS, first_page, last_page
+                ))
+        return paths
+
+    def _produce_pages(self, page_queue, render_dpi, max_size, jpg_quality, executor, pdf_indices, split_pages, temp_dir):
+        """
+        画像化スレッド: ファイルを順に画像化し、
+        (ファイル番号, ファイル名, ページ番号, ページ数, ページ) をキューに積む
+        読み込みに失敗したファイルはページ番号をNoneとし、ページに例外を入れる
+        PDFのページは一時フォルダから1枚ずつ読み込み、読んだファイルは削除する
+        プロセスプールには先読み分 (POOL_WORKERS件) だけを投入する
+        split_pages に含まれるPDF (ファイル番号 -> ページ数) はページ範囲に分けて投入する
+        """
         total_files = len(self.file_list)
+        pending = iter(pdf_indices) if executor else iter(())
+        futures = {}
+        for i, file_path in enumerate(self.file_list):
+            if not self.is_running:
+                break
+
+            while len(futures) < POOL_WORKERS:
+                next_index = next(pending, None)
+                if next_index is None:
+                    break
+                try:
+                    futures[next_index] = [
+                        (executor.submit(
+                            _rasterize, self.file_list[next_index], render_dpi, jpg_quality, temp_dir,
+                            1, first_page, last_page
+                        ), first_page, last_page)
+                        for first_page, last_page in _page_ranges(split_pages.get(next_index))
+                    ]
+                except Exception:
+                    # プールが使えなくなった場合 (子プロセスの異常終了など) は以降をこのスレッドで処理する
+                    pending = iter(())
+                    break
+
+            file_name = os.path.basename(file_path)
+
+            try:
+                if file_path.lower().endswith('.pdf'):
+                    # PDFの場合
+                    self._emit_status(f"[{i+1}/{total_files}] {file_name}: 画像データを読み込み中...", force=True)
+                    # PDF変換 (重い処理)
+                    if i in futures:
+                        pages = self._collect_pool_pages(futures.pop(i), file_path, render_dpi, jpg_quality, temp_dir)
+                        total_pages = len(pages)
+                    elif pdfium is not None:
+                        # 描画したページから順にキューへ流し、スライドの組み立てと重ねる
+                        total_pages, pages = _stream_pdfium(file_path, render_dpi, jpg_quality)
+                    else:
+                        pages = _rasterize(
+                            file_path, render_dpi, jpg_quality, temp_dir, thread_count=RASTERIZE_THREADS
+                        )
+                        total_pages = len(pages)
+                else:
+                    # 画像ファイルの場合 (エンコードは組み立て側で行う)
+                    self._emit_status(f"[{i+1}/{total_files}] {file_name}: 画像を開いています...", force=True)
+                    pages = [self._load_image(file_path, max_size)]
+                    total_pages = 1
+
+                if not total_pages:
+                    self._put(page_queue, (i, file_name, None, 0, None))
+                    continue
+
+                for p_idx, page in enumerate(pages):
+                    if isinstance(page, str):
+                        with open(page, 'rb') as f:
+                            data = f.read()
+                        os.remove(page)
+                        page = data
+                    if not self._put(page_queue, (i, file_name, p_idx, total_pages, page)):
+                        break
+            except Exception as e:
+                self._put(page_queue, (i, file_name, None, 0, e))
+
+        self._put(page_queue, None)
+
+    def _build_slides(self, prs, render_dpi, max_size, jpg_quality, temp_dir):
+        """画像化スレッドからページを受け取り、スライドを組み立てる"""
+        total_files = len(self.file_list)
+        processed_count = 0
+
+        # PDFが複数ある場合はプロセスプールで並列に画像化する
+        # PDFが1つだけでもページ数が多い場合は、ページ範囲に分けて並列に画像化する
+        # (その場合はページが一時ファイルを経由し、範囲ごとにPDFを開き直すため、
+        #  ページ数の少ないPDFはこのプロセス内で描画したほうが速い)
+        # Qtのスレッドが動いているプロセスからforkしないよう、spawnで起動する
+        pdf_indices = [i for i, f in enumerate(self.file_list) if f.lower().endswith('.pdf')]
+        split_pages = {}
+        if len(pdf_indices) == 1 and POOL_WORKERS > 1:
+            try:
+                page_count = _pdf_page_count(self.file_list[pdf_indices[0]])
+            except Exception:
+                page_count = 0 # 読み込めないPDFはエラー表示を画像化スレッドに任せる
+            if page_count >= SPLIT_MIN_PAGES:
+                split_pages[pdf_indices[0]] = page_count
+
+        executor = None
+        if len(pdf_indices) > 1 or split_pages:
+            executor = ProcessPoolExecutor(
+                max_workers=POOL_WORKERS if split_pages else min(POOL_WORKERS, len(pdf_indices)),
+                mp_context=multiprocessing.get_context('spawn')
+            )
+
+        # 画像化は別スレッドで先行させ、このスレッドはスライドの組み立てに専念する
+        page_queue = queue.Queue(maxsize=PAGE_QUEUE_SIZE)
+        producer = threading.Thread(
+            target=self._produce_pages,
+            args=(page_queue, render_dpi, max_size, jpg_quality, executor, pdf_indices, split_pages, temp_dir),
+            daemon=True
+        )
+        producer.start()
+
+        # ループ内で毎回参照しないよう先に取り出しておく
+        blank_slide_layout = prs.slide_layouts[6]
+        add_slide = prs.slides.add_slide
+        slide_w, slide_h = prs.slide_width, prs.slide_height
+        emit_status = self._emit_status
+        emit_progress = self.progress_updated.emit
+        get_page = page_queue.get
+
+        # 2. ページ処理ループ
+        # (中断はGUIスレッドから is_running が書き換えられるため毎回参照する)
+        try:
+            while True:
+                try:
+                    item = get_page(timeout=0.1)
+                except queue.Empty:
+                    # 画像化スレッドが異常終了した場合も待ち続けない
+                    if self.is_running and (producer.is_alive() or not page_queue.empty()):
+                        continue
+                    break
+                if item is None or not self.is_running:
+                    break
+
+                i, file_name, p_idx, total_pages, page = item
+
+                if p_idx is None:
+                    # 読み込めなかったファイル (ページにはエラーまたはNoneが入っている)
+                    if page is None:
+                        emit_status(f"警告: 画像が取得できませんでした ({file_name})", force=True)
+                    else:
+                        emit_status(f"エラー発生 ({file_name}): {str(page)}", force=True)
+                    processed_count += 1
+                    emit_progress(int((processed_count / total_files) * 100))
+                    continue
+
+                # 詳細なステータス表示: ファイル名 ページ X / Y
+                emit_status(PAGE_STATUS, i + 1, total_files, file_name, p_idx + 1, total_pages)
+
+                try:
+                    if not isinstance(page, bytes):
+                        # 画像ファイルはここでエンコードする
+                        page = _encode_jpeg(page, _jpeg_quality(page.width * page.height))
+
+                    slide = add_slide(blank_slide_layout)
+
+                    # エンコード済みのJPEGをそのまま渡す (再エンコードしない)
+                    # BytesIO(bytes) はコピーせずに元のバイト列を参照する
+                    # 同じ画像はpython-pptxがSHA-1で判定して1つの画像パーツを共有する
+                    slide.shapes.add_picture(
+                        BytesIO(page), 
+                        0, 0, 
+                        width=slide_w, 
+                        height=slide_h
+                    )
+
+                except Exception as e:
+                    emit_status(f"エラー発生 ({file_name}): {str(e)}", force=True)
+
+                # ファイルの最終ページで進捗を進める
+                if p_idx + 1 == total_pages:
+                    processed_count += 1
+                    emit_progress(int((processed_count / total_files) * 100))
+        finally:
+            producer.join()
+            if executor:
+                # 実行中の画像化が一時フォルダに書き込み終えるのを待ってから片付ける
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    def run(self):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # ログファイル出力は廃止
@@ -77,82 +535,35 @@ class ConversionWorker(QThread):
         else:
             self.status_updated.emit("サイズ取得失敗。デフォルトサイズを使用します。")
 
+        # 表示解像度を超える画素は持たない (PDFは低いDPIで描画、画像は縮小)
+        render_dpi = self.dpi
+        max_size = None
+        if self.output_dpi:
+            render_dpi = min(self.dpi, self.output_dpi)
+            max_size = (
+                int(prs.slide_width / 914400 * self.output_dpi),
+                int(prs.slide_height / 914400 * self.output_dpi)
+            )
+        # PDFのページはスライドと同じ大きさとみなし、描画後の画素数から画質を決める
+        # (画像ファイルは縮小後の画素数から同じ基準で決める)
+        jpg_quality = _jpeg_quality(
+            int(prs.slide_width / 914400 * render_dpi) * int(prs.slide_height / 914400 * render_dpi)
+        )
+
         output_filename = f"Combined_Slides_{timestamp}.pptx"
         save_path = os.path.join(self.output_dir, output_filename)
 
-        processed_count = 0
-
-        # 2. ファイル処理ループ
-        for i, file_path in enumerate(self.file_list):
-            if not self.is_running:
-                break
-
-            file_name = os.path.basename(file_path)
-            
-            try:
-                images_to_process = []
-
-                if file_path.lower().endswith('.pdf'):
-                    # PDFの場合
-                    self.status_updated.emit(f"[{i+1}/{total_files}] {file_name}: 画像データを読み込み中...")
-                    # PDF変換 (重い処理)
-                    images = convert_from_path(file_path, dpi=self.dpi, fmt='jpeg')
-                    
-                    if not images:
-                        self.status_updated.emit(f"警告: 画像が取得できませんでした ({file_name})")
-                        continue
-                    
-                    images_to_process = images
-                else:
-                    # 画像ファイルの場合
-                    self.status_updated.emit(f"[{i+1}/{total_files}] {file_name}: 画像を開いています...")
-                    try:
-                        img = Image.open(file_path)
-                        if img.mode in ('RGBA', 'P'):
-                            img = img.convert('RGB')
-                        images_to_process = [img]
-                    except Exception as e:
-                        print(f"Error: {e}")
-                        continue
-
-                # スライドへの追加処理 (ページごとの進捗を表示)
-                total_pages = len(images_to_process)
-                for p_idx, img in enumerate(images_to_process):
-                    if not self.is_running:
-                        break
-                    
-                    # 詳細なステータス表示: ファイル名 ページ X / Y
-                    msg = f"[{i+1}/{total_files}] {file_name}: ページ {p_idx + 1} / {total_pages} を変換中"
-                    self.status_updated.emit(msg)
-
-                    blank_slide_layout = prs.slide_layouts[6]
-                    slide = prs.slides.add_slide(blank_slide_layout)
-
-                    image_stream = BytesIO()
-                    jpg_quality = 95 if self.dpi >= 300 else 85
-                    img.save(image_stream, format="JPEG", quality=jpg_quality)
-                    image_stream.seek(0)
-
-                    slide.shapes.add_picture(
-                        image_stream, 
-                        0, 0, 
-                        width=prs.slide_width, 
-                        height=prs.slide_height
-                    )
-                    image_stream.close()
-
-            except Exception as e:
-                self.status_updated.emit(f"エラー発生 ({file_name}): {str(e)}")
-            
-            processed_count += 1
-            progress = int((processed_count / total_files) * 100)
-            self.progress_updated.emit(progress)
+        # ページ画像の一時保存先 (途中で終了しても必ず片付ける)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self._build_slides(prs, render_dpi, max_size, jpg_quality, temp_dir)
 
         # 保存
         if self.is_running:
             self.status_updated.emit("ファイルを保存しています...")
             try:
-                prs.save(save_path)
+                # 大きなバッファ経由で書き出し、書き込み回数を抑える
+                with open(save_path, 'wb', buffering=SAVE_BUFFER_SIZE) as f:
+                    prs.save(f)
                 self.status_updated.emit("保存完了！")
             except Exception as e:
                 self.status_updated.emit(f"保存失敗: {str(e)}")
@@ -165,11 +576,13 @@ class ConversionWorker(QThread):
 
 class FileDropListWidget(QListWidget):
     VALID_EXTENSIONS = ('.pdf', '.png', '.jpg', '.jpeg', '.bmp', '.tiff')
+    _EXT_SET = frozenset(VALID_EXTENSIONS)
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setAcceptDrops(True)
         self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self._paths = set() # 重複チェック用 (リストを毎回走査しない)
 
     def dragEnterEvent(self, event: QDragEnterEvent):
         if event.mimeData().hasUrls():
@@ -192,22 +605,58 @@ class FileDropListWidget(QListWidget):
             event.ignore()
 
     def add_files(self, file_paths):
+        new_paths = []
         for path in file_paths:
-            if os.path.isfile(path) and path.lower().endswith(self.VALID_EXTENSIONS):
-                items = [self.item(i).text() for i in range(self.count())]
-                if path not in items:
-                    self.addItem(path)
+            if os.path.isfile(path) and os.path.splitext(path)[1].lower() in self._EXT_SET:
+                new_paths.append(path)
             elif os.path.isdir(path):
-                self.add_folder(path)
+                new_paths.extend(self._folder_files(path))
+        self._add_paths(new_paths)
     
     def add_folder(self, folder_path):
-        for root, dirs, files in os.walk(folder_path):
-            for file in files:
-                if file.lower().endswith(self.VALID_EXTENSIONS):
-                    full_path = os.path.join(root, file)
-                    items = [self.item(i).text() for i in range(self.count())]
-                    if full_path not in items:
-                        self.addItem(full_path)
+        self._add_paths(self._folder_files(folder_path))
+
+    def _folder_files(self, folder_path):
+        """フォルダ以下の対応ファイルを列挙 (順序はos.walkと同じ)"""
+        stack = [folder_path]
+        while stack:
+            current = stack.pop()
+            subdirs = []
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in self._EXT_SET:
+                            yield entry.path
+            except OSError:
+                continue
+            stack.extend(reversed(subdirs))
+
+    def _add_paths(self, paths):
+        """未登録のパスだけをまとめてリストに追加"""
+        new_paths = []
+        for path in paths:
+            if path not in self._paths:
+                self._paths.add(path)
+                new_paths.append(path)
+        if new_paths:
+            self.addItems(new_paths)
+
+    # 登録済みパスの集合をリストの内容と同期させる
+    def insertItem(self, row, item):
+        super().insertItem(row, item)
+        self._paths.add(item.text() if isinstance(item, QListWidgetItem) else item)
+
+    def takeItem(self, row):
+        item = super().takeItem(row)
+        if item is not None:
+            self._paths.discard(item.text())
+        return item
+
+    def clear(self):
+        super().clear()
+        self._paths.clear()
 
 
 class PdfToPptApp(QWidget):
@@ -288,8 +737,17 @@ class PdfToPptApp(QWidget):
         self.combo_dpi.addItem("最高画質 (400 dpi)", 400)
         self.combo_dpi.setCurrentIndex(2)
 
+        lbl_output_dpi = QLabel("出力解像度:")
+        self.combo_output_dpi = QComboBox()
+        self.combo_output_dpi.addItem("スクリーン用 (150 dpi)", 150)
+        self.combo_output_dpi.addItem("印刷用 (300 dpi)", 300)
+        self.combo_output_dpi.addItem("縮小しない", None)
+        self.combo_output_dpi.setCurrentIndex(2)
+
         settings_layout.addWidget(lbl_dpi)
         settings_layout.addWidget(self.combo_dpi)
+        settings_layout.addWidget(lbl_output_dpi)
+        settings_layout.addWidget(self.combo_output_dpi)
         settings_layout.addStretch()
         
         main_layout.addWidget(settings_frame)
@@ -379,6 +837,7 @@ class PdfToPptApp(QWidget):
             return
             
         selected_dpi = self.combo_dpi.currentData()
+        selected_output_dpi = self.combo_output_dpi.currentData()
 
         self.toggle_ui(False)
         self.progress_bar.setValue(0)
@@ -386,7 +845,7 @@ class PdfToPptApp(QWidget):
 
         file_list = [self.list_widget.item(i).text() for i in range(count)]
 
-        self.worker = ConversionWorker(file_list, output_dir, dpi=selected_dpi)
+        self.worker = ConversionWorker(file_list, output_dir, dpi=selected_dpi, output_dpi=selected_output_dpi)
         self.worker.progress_updated.connect(self.update_progress)
         self.worker.status_updated.connect(self.update_status) # ログではなくステータス更新に接続
         self.worker.finished_signal.connect(self.conversion_finished)
@@ -428,6 +887,7 @@ class PdfToPptApp(QWidget):
         self.btn_down.setEnabled(enabled)
         self.list_widget.setEnabled(enabled)
         self.combo_dpi.setEnabled(enabled)
+        self.combo_output_dpi.setEnabled(enabled)
         
         if enabled:
             self.btn_convert.setText("変換開始")
@@ -445,6 +905,9 @@ class PdfToPptApp(QWidget):
             self.btn_convert.setEnabled(False) 
 
 if __name__ == "__main__":
+    # PyInstallerで実行ファイル化した場合にプロセスプールを使うため
+    multiprocessing.freeze_support()
+
     app = QApplication(sys.argv)
     
     if hasattr(Qt, 'AA_EnableHighDpiScaling'):